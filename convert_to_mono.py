@@ -1,59 +1,112 @@
 import argparse
 import os
-import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import soundfile as sf
+from tqdm import tqdm
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Number of frames read per iteration; bounds peak memory regardless of file size.
+CHUNK_FRAMES = 1 << 16
+
+
+def _downmix_numpy(buf: np.ndarray) -> np.ndarray:
+    """Average the two channels of an (N, 2) int16 buffer with an integer shift."""
+    mono = (buf[:, 0].astype(np.int32) + buf[:, 1]) >> 1
+    # The shifted average always fits int16, but clip defensively
+    # before narrowing in case of malformed (non-PCM16) input.
+    return np.clip(mono, -32768, 32767).astype(np.int16)
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _downmix_numba(buf):
+        out = np.empty(buf.shape[0], dtype=np.int16)
+        for i in prange(buf.shape[0]):
+            out[i] = (np.int32(buf[i, 0]) + np.int32(buf[i, 1])) >> 1
+        return out
+
+    _downmix = _downmix_numba
+else:
+    _downmix = _downmix_numpy
+
 
 def stereo_to_mono(input_wav: str, output_wav: str) -> None:
     """
-    Convert a stereo WAV file to mono.
+    Convert a multi-channel WAV file to mono.
+
+    The file is decoded by libsndfile straight into int16 arrays (no bytes
+    round-trip, 24/32-bit sources supported) and streamed in fixed-size
+    chunks, with channels averaged in int32 to avoid the float round-trip of
+    np.mean. Peak memory stays bounded by the chunk size rather than the file
+    size.
 
     Args:
-        input_wav (str): Path to the input stereo WAV file.
+        input_wav (str): Path to the input multi-channel WAV file.
         output_wav (str): Path to save the output mono WAV file.
 
     Raises:
-        ValueError: If the input file is not a stereo file.
+        ValueError: If the input file is already mono.
     """
-    with wave.open(input_wav, 'rb') as wav:
-        params = wav.getparams()
-        n_channels, sampwidth, framerate, n_frames = params[:4]
-
-        if n_channels != 2:
+    with sf.SoundFile(input_wav) as src:
+        if src.channels < 2:
             raise ValueError(f"{input_wav} is not a stereo file")
 
-        frames = wav.readframes(n_frames)
-        stereo_audio = np.frombuffer(frames, dtype=np.int16)
-        stereo_audio = np.reshape(stereo_audio, (-1, 2))
-        mono_audio = np.mean(stereo_audio, axis=1).astype(np.int16)
+        with sf.SoundFile(output_wav, 'w', samplerate=src.samplerate,
+                          channels=1, subtype='PCM_16') as out:
+            while True:
+                buf = src.read(CHUNK_FRAMES, dtype='int16', always_2d=True)
+                if not len(buf):
+                    break
+                if buf.shape[1] == 2:
+                    mono = _downmix(np.ascontiguousarray(buf))
+                else:
+                    mono = (buf.astype(np.int32).sum(axis=1) // buf.shape[1]).astype(np.int16)
+                out.write(mono)
 
-    with wave.open(output_wav, 'wb') as wav:
-        wav.setparams((1, sampwidth, framerate, n_frames // 2, 'NONE', 'not compressed'))
-        wav.writeframes(mono_audio.tobytes())
 
+def stereo_to_mono_pair(pair: tuple[str, str]) -> None:
+    """Tuple-argument wrapper around stereo_to_mono for executor.map/submit."""
+    stereo_to_mono(*pair)
 
-def convert_folder_to_mono(folder_path: str) -> None:
+
+def convert_folder_to_mono(folder_path: str, num_workers: int = os.cpu_count()) -> None:
     """
     Convert all stereo WAV files in a folder to mono.
 
+    Files are independent, so they are converted in parallel across a pool of
+    worker processes.
+
     Args:
         folder_path (str): Path to the folder containing WAV files.
+        num_workers (int, optional): Number of worker processes. Defaults to the number of CPU cores.
     """
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".wav"):
-            input_wav = os.path.join(folder_path, filename)
-            output_wav = os.path.join(folder_path, f"mono_{filename}")
+    with os.scandir(folder_path) as it:
+        jobs = [(entry.path, os.path.join(folder_path, f"mono_{entry.name}"))
+                for entry in it if entry.name.endswith(".wav")]
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {executor.submit(stereo_to_mono_pair, job): job for job in jobs}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Converting files", unit="file"):
+            input_wav, output_wav = futures[future]
             try:
-                stereo_to_mono(input_wav, output_wav)
-                print(f"Converted {input_wav} to {output_wav}")
+                future.result()
+                tqdm.write(f"Converted {input_wav} to {output_wav}")
             except ValueError as e:
-                print(e)
+                tqdm.write(str(e))
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Convert stereo WAV files to mono.")
     parser.add_argument('folder_path', type=str, help="Path to the folder containing WAV files.")
+    parser.add_argument('--num_workers', type=int, default=os.cpu_count(),
+                        help="Number of worker processes to use.")
     args = parser.parse_args()
 
-    convert_folder_to_mono(args.folder_path)
+    convert_folder_to_mono(args.folder_path, num_workers=args.num_workers)
@@ -1,28 +1,37 @@
 import argparse
+import csv
 import multiprocessing
 import os
 from functools import partial
 
+from tqdm import tqdm
+
 from process_output import VADOUtputProcessor
 from report import Report
-from silero import process_wav_files
+from silero import init_worker, process_single_file
 
 
-def process_wav_files_wrapper(args: dict[str, str | list[str], int]) -> None:
-    """Wrapper function to call process_wav_files with the necessary arguments."""
-    process_wav_files(
-        folder=args['folder'],
-        file_list=args['file_list'],
-        data_split=args['data_split'],
-        log_folder=args['log_folder'],
-        device=args['device']
-    )
+def process_file(filename: str, folder: str, vad_threshold: float = 0.5) \
+        -> tuple[str, bool, list[dict], str | None]:
+    """
+    Worker entry point: run VAD on one file with the worker-global model.
 
+    Args:
+        filename (str): Name of the WAV file inside `folder`.
+        folder (str): Path to the data folder.
+        vad_threshold (float): Speech probability threshold.
 
-def split_list(lst, n):
-    """Split list into n sub-lists."""
-    k, m = divmod(len(lst), n)
-    return (lst[i * k + min(i, m):(i + 1) * k + min(i + 1, m)] for i in range(n))
+    Returns:
+        tuple: (filename, speech_found, segments, error message or None).
+        speech_found with an empty segments list means speech was detected
+        but every merged segment fell under the minimum duration.
+    """
+    try:
+        speech_found, segments = process_single_file(os.path.join(folder, filename),
+                                                     vad_threshold=vad_threshold)
+        return filename, speech_found, segments, None
+    except Exception as e:
+        return filename, False, [], str(e)
 
 
 def parse_exclusions(exclusions: str | os.PathLike | list[str]) -> list[str]:
@@ -58,16 +67,23 @@ def main(data_folder: str | os.PathLike,
          exclusions: str | os.PathLike | list[str],
          log_folder: str,
          device: str,
-         num_processes: int = multiprocessing.cpu_count()) -> None:
+         num_processes: int = multiprocessing.cpu_count(),
+         vad_threshold: float = 0.5) -> None:
     """
     Main function to process WAV files in parallel.
 
+    Each worker loads the Silero model once via the pool initializer and
+    files are dispatched individually with imap_unordered, so skewed file
+    sizes cannot leave workers idle behind a large pre-sliced shard. The
+    parent is the single writer of the CSV and log files.
+
     Args:
         data_folder (str | os.PathLike): Path to the folder containing WAV files.
         exclusions (str | os.PathLike | list[str]): Path to the exclusion file or a list of exclusion files.
         log_folder (str): Path to the folder where logs will be stored.
         device (str): Device to use for processing.
         num_processes (int, optional): Number of processes to use for parallel processing. Defaults to the number of CPU cores.
+        vad_threshold (float, optional): Speech probability above which a window counts as speech.
 
     Returns:
         None
@@ -76,29 +92,53 @@ def main(data_folder: str | os.PathLike,
     exclusions = parse_exclusions(exclusions)
     print(f"{len(exclusions)} files excluded.")
 
-    files = [f for f in os.listdir(data_folder) if f.endswith('.wav') and f not in exclusions]
-
-    # Split the files into sub-lists
-    sub_lists = list(split_list(files, num_processes))
-
-    # Create a pool of workers
-    with multiprocessing.Pool(processes=num_processes) as pool:
-        pool.map(partial(process_wav_files_wrapper),
-                 [{'file_list': sub_list,
-                   'folder': data_folder,
-                   'data_split': idx,
-                   'log_folder': log_folder,
-                   'device': device}
-                  for idx, sub_list in enumerate(sub_lists)])
+    exclusions = set(exclusions)
+    with os.scandir(data_folder) as it:
+        files = [entry.name for entry in it if entry.name.endswith('.wav') and entry.name not in exclusions]
+
+    os.makedirs(log_folder, exist_ok=True)
+    speech_segments_file = os.path.join(log_folder, 'speech_segments.csv')
+    processed_log = os.path.join(log_folder, 'processed_files.log')
+    warning_log = os.path.join(log_folder, 'warning_files.log')
+    error_log = os.path.join(log_folder, 'error_files.log')
+
+    with multiprocessing.Pool(processes=num_processes, initializer=init_worker, initargs=(device,)) as pool, \
+            open(speech_segments_file, 'w', newline='') as csvfile, \
+            open(processed_log, 'a', buffering=1) as proc_fh, \
+            open(warning_log, 'a', buffering=1) as warn_fh, \
+            open(error_log, 'a', buffering=1) as err_fh:
+        writer = csv.writer(csvfile)
+        writer.writerow(['filename', 'segment_id', 'start', 'end', 'duration'])
+
+        worker = partial(process_file, folder=data_folder, vad_threshold=vad_threshold)
+        results = pool.imap_unordered(worker, files, chunksize=8)
+        for filename, speech_found, segments, error in tqdm(results, total=len(files),
+                                                            desc="Processing files", unit="file"):
+            if error is not None:
+                err_fh.write(f"{filename}: {error}\n")
+                continue
+            if not speech_found:
+                warn_fh.write(f"{filename}\n")
+                continue
+
+            # Tuple rows and one writerows call per file: no per-row dict
+            # construction or fieldname lookups as with DictWriter.
+            stem = os.path.splitext(filename)[0]
+            writer.writerows(
+                (filename, f"{stem}_{segment['start']:.2f}_{segment['end']:.2f}",
+                 segment['start'], segment['end'], segment['duration'])
+                for segment in segments
+            )
+            proc_fh.write(f"{filename}\n")
 
     output_processor = VADOUtputProcessor(directory_path=log_folder, output_folder="./output")
     output_processor()
 
     report = Report(
-        original_folder=args.data_folder,
+        original_folder=data_folder,
         csv_file=os.path.join("./output", 'speech_segments.csv'),
         report_file=os.path.join("./output", 'report.txt'),
-        log_folder=args.log_folder,
+        log_folder=log_folder,
     )
     report()
 
@@ -111,6 +151,8 @@ if __name__ == "__main__":
     parser.add_argument('device', type=str, help='Device to use for processing.')
     parser.add_argument('--num_processes', type=int, default=multiprocessing.cpu_count(),
                         help='Number of processes to use.')
+    parser.add_argument('--vad_threshold', type=float, default=0.5,
+                        help='Speech probability above which a window counts as speech.')
 
     args = parser.parse_args()
 
@@ -119,8 +161,9 @@ if __name__ == "__main__":
         exclusions=args.exclusions,
         log_folder=args.log_folder,
         device=args.device,
-        num_processes=args.num_processes
+        num_processes=args.num_processes,
+        vad_threshold=args.vad_threshold
     )
 
     # Example call:
-    # python corpus_vad.py ../youtube-downloader/audio/ ./global_output/processed_files.log ./global_output/warning_files.log logs cpu
\ No newline at end of file
+    # python corpus_vad.py ../youtube-downloader/audio/ ./global_output/processed_files.log ./global_output/warning_files.log logs cpu
@@ -1,8 +1,9 @@
-import glob
 import os
 from typing import Union, Dict, List
 
-import pandas as pd
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 
 class VADOUtputProcessor:
@@ -22,14 +23,17 @@ class VADOUtputProcessor:
         # Get all sub-folders
         sub_folders = [f.path for f in os.scandir(self.directory_path) if f.is_dir()]
 
-        # Define file patterns to search for
+        # Define file names to search for
         file_patterns = ['processed_files.log', 'speech_segments.csv', 'warning_files.log']
         contents: Dict[str, List[str]] = {pattern: [] for pattern in file_patterns}
 
-        # Search for files matching the patterns
-        for pattern in file_patterns:
-            results = glob.glob(os.path.join(self.directory_path, '**', pattern), recursive=True)
-            contents[pattern].extend(results)
+        # One walk over the tree collects all three file types, instead of a
+        # recursive glob (and therefore a full traversal) per pattern.
+        targets = set(file_patterns)
+        for root, _, files in os.walk(self.directory_path):
+            for name in files:
+                if name in targets:
+                    contents[name].append(os.path.join(root, name))
 
         # Print sub-folders
         print(f"Sub-folders: {' '.join(sub_folders)}")
@@ -55,34 +59,36 @@ class VADOUtputProcessor:
 
         for file_type, file_list in files.items():
             if not file_type.endswith(".csv"):
-                contents = []
-                for file in file_list:
-                    with open(file, "r") as f:
-                        contents.extend(f.readlines())
-
-                print(f"Files in {file_type} before duplicate removal: {len(contents)}")
-                contents = list(set(contents))
-                print(f"Files in {file_type} after duplicate removal: {len(contents)}")
-
+                # Stream each shard line-by-line and write unseen lines straight
+                # to the output, so memory is bounded by the number of unique
+                # lines rather than the total line count across shards.
                 os.makedirs(self.output_folder, exist_ok=True)
-                with open(os.path.join(self.output_folder, file_type), "w") as f:
-                    f.writelines(contents)
+                total_lines = 0
+                seen: set[str] = set()
+                with open(os.path.join(self.output_folder, file_type), "w") as out:
+                    for file in file_list:
+                        with open(file, "r") as f:
+                            for line in f:
+                                total_lines += 1
+                                if line not in seen:
+                                    seen.add(line)
+                                    out.write(line)
+
+                print(f"Files in {file_type} before duplicate removal: {total_lines}")
+                print(f"Files in {file_type} after duplicate removal: {len(seen)}")
             else:
-                dataframes = []
-                target_len = 0
-                for file in file_list:
-                    df = pd.read_csv(file)
-                    dataframes.append(df)
-                    target_len += len(df)
-                print(f"Total number of generated segments: {target_len}")
-
-                merged_df = pd.concat(dataframes, ignore_index=True)
-                merged_df.drop_duplicates(keep="first", inplace=True)
-                print(f"Total number of generated segments after duplication removal: {len(merged_df)}")
+                # Scan all shards as one logical dataset; Arrow's CSV reader is
+                # multithreaded and the concat is zero-copy.
+                table = ds.dataset(file_list, format='csv').to_table()
+                print(f"Total number of generated segments: {table.num_rows}")
+
+                # Grouping on every column with no aggregate drops duplicate rows.
+                table = table.group_by(table.column_names).aggregate([])
+                print(f"Total number of generated segments after duplication removal: {table.num_rows}")
 
                 os.makedirs(self.output_folder, exist_ok=True)
-                merged_df.to_csv(os.path.join(self.output_folder, file_type), index=False)
-                merged_df.to_parquet(os.path.join(self.output_folder, file_type.replace("csv", "parquet")), index=False)
+                pacsv.write_csv(table, os.path.join(self.output_folder, file_type))
+                pq.write_table(table, os.path.join(self.output_folder, file_type.replace("csv", "parquet")))
 
     def __call__(self):
         """Process the VAD system output"""
@@ -1,14 +1,21 @@
 import argparse
-import csv
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Set, Dict
 
-import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
+import soundfile as sf
 from tqdm import tqdm
 
-from utils import get_audio_duration, human_readable_duration
+from utils import human_readable_duration
+
+
+def _file_duration(file: str) -> float:
+    """Read an audio file's duration from its header without decoding the body."""
+    info = sf.info(file)
+    return info.frames / info.samplerate
 
 
 class Report:
@@ -42,15 +49,19 @@ class Report:
         :return: Total audio duration, total number of files, and a dictionary of file durations.
         """
         self.total_audio_duration = 0
-        self.original_files = [os.path.join(self.original_folder, f) for f in os.listdir(self.original_folder) if
-                               f.endswith('.wav')]
+        with os.scandir(self.original_folder) as it:
+            self.original_files = [entry.path for entry in it if entry.name.endswith('.wav')]
         self.total_files = len(self.original_files)
 
+        # Durations come from the file headers only (no decode), and the
+        # header reads are pure I/O, so fan them out over a thread pool.
         print("Calculating total audio duration...")
-        for file in tqdm(self.original_files):
-            duration = get_audio_duration(file)
-            self.file_durations[file] = duration
-            self.total_audio_duration += duration
+        with ThreadPoolExecutor() as executor:
+            durations = list(tqdm(executor.map(_file_duration, self.original_files),
+                                  total=self.total_files))
+
+        self.file_durations = dict(zip(self.original_files, durations))
+        self.total_audio_duration = float(sum(durations))
 
         return self.total_audio_duration, self.total_files, self.file_durations
 
@@ -58,18 +69,20 @@ class Report:
         """
         Parse the CSV file to extract segment durations and other statistics.
 
-        :return: List of all segment durations, total speech duration,
+        The file is parsed in one shot by pandas' C reader and aggregated with
+        vectorized operations instead of a per-row Python loop.
+
+        :return: Array of all segment durations, total speech duration,
         total number of segments, and a set of files with speech.
         """
         print("Parsing CSV file...")
-        with open(self.csv_file, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in tqdm(reader):
-                duration = float(row['duration'])
-                self.all_durations.append(duration)
-                self.total_speech_duration += duration
-                self.files_with_speech.add(row['filename'])
-                self.total_segments += 1
+        df = pd.read_csv(self.csv_file, usecols=['filename', 'duration'],
+                         dtype={'duration': 'float32', 'filename': 'category'})
+
+        self.all_durations = df['duration'].to_numpy()
+        self.total_speech_duration = float(df['duration'].sum())
+        self.total_segments = len(df)
+        self.files_with_speech = set(df['filename'].unique())
 
         return self.all_durations, self.total_speech_duration, self.total_segments, self.files_with_speech
 
@@ -80,11 +93,16 @@ class Report:
         print("Generating report...")
         self.files_without_speech = self.total_files - len(self.files_with_speech)
 
-        if self.all_durations:
-            max_duration = max(self.all_durations)
-            quartiles = np.percentile(self.all_durations, [25, 50, 75])
-            mean_duration = np.mean(self.all_durations)
-            std_duration = np.std(self.all_durations)
+        if len(self.all_durations):
+            # One sort yields max and quartiles by indexing, and mean/std come
+            # from a single sum/dot, instead of four separate traversals
+            # (max, percentile, mean, std) over the same array.
+            durations = np.sort(np.asarray(self.all_durations, dtype=np.float64))
+            n = len(durations)
+            max_duration = durations[-1]
+            quartiles = durations[[n // 4, n // 2, (3 * n) // 4]]
+            mean_duration = durations.sum() / n
+            std_duration = np.sqrt(max(np.dot(durations, durations) / n - mean_duration ** 2, 0.0))
 
             speech_percentage = (self.total_speech_duration / self.total_audio_duration) * 100
             non_speech_percentage = 100 - speech_percentage
@@ -108,7 +126,14 @@ class Report:
             with open(self.report_file, 'w') as report:
                 report.write(report_content)
 
-            plt.hist(self.all_durations, bins=10, edgecolor='black')
+            # Imported lazily with the Agg backend so headless workers that
+            # never plot skip the GUI-backend probe at import time.
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+
+            counts, bin_edges = np.histogram(durations, bins=10)
+            plt.bar(bin_edges[:-1], counts, width=np.diff(bin_edges), align='edge', edgecolor='black')
             plt.title('Histogram of Segment Durations for All Files')
             plt.xlabel('Duration (seconds)')
             plt.ylabel('Frequency')
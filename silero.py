@@ -1,16 +1,29 @@
 import argparse
-import csv
+import bisect
 import logging
+import mmap
 import os
 import sys
+import wave
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, nullcontext
 from typing import Any
 from typing import List, Dict
 
+import numpy as np
+import soundfile as sf
 import torch
-from silero_vad import load_silero_vad, read_audio, get_speech_timestamps
+from scipy.signal import resample_poly
+from silero_vad import load_silero_vad, get_speech_timestamps
 from tqdm import tqdm
 
 from report import Report
+from utils import get_audio_duration
+
+# Let the CUDA caching allocator grow segments instead of fragmenting; must
+# be set before the first allocation, so do it at import time.
+os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'expandable_segments:True')
 
 
 def setup_logging(log_folder: str) -> None:
@@ -31,10 +44,564 @@ def setup_logging(log_folder: str) -> None:
     )
 
 
+# Sample rate every waveform is normalized to before VAD; the reciprocal
+# turns the many sample->second conversions into multiplies.
+SR = 16_000
+INV_SR = 1.0 / SR
+
+# Silero VAD frame size (samples per window at 16 kHz).
+WINDOW_SAMPLES = 512
+
+
+def load_audio(file_path: str) -> torch.Tensor:
+    """
+    Load an audio file as a 16 kHz mono float32 tensor.
+
+    Decodes via libsndfile straight into a numpy array and resamples with
+    scipy's polyphase filter only when needed, avoiding the duplicate file
+    open and per-call resampler setup of silero_vad.read_audio.
+
+    Args:
+        file_path (str): Path to the audio file.
+
+    Returns:
+        torch.Tensor: 1-D float32 waveform at 16 kHz.
+    """
+    data, sr = sf.read(file_path, dtype='float32')
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    if sr != SR:
+        data = resample_poly(data, SR, sr).astype(np.float32)
+    return torch.from_numpy(data)
+
+
+def probs_to_timestamps(probs: List[float],
+                        n_samples: int,
+                        threshold: float = 0.5,
+                        min_silence_samples: int = 1_600,
+                        min_speech_samples: int = 4_000,
+                        speech_pad_samples: int = 480) -> List[Dict[str, int]]:
+    """
+    Convert per-window speech probabilities into start/end sample timestamps.
+
+    Mirrors the hysteresis of silero_vad.get_speech_timestamps: speech starts
+    once the probability reaches `threshold` and ends once it has stayed below
+    `threshold - 0.15` for `min_silence_samples`.
+
+    Args:
+        probs (List[float]): Speech probability per 512-sample window.
+        n_samples (int): True (unpadded) length of the waveform in samples.
+        threshold (float): Probability above which a window counts as speech.
+        min_silence_samples (int): Silence run needed to close a segment.
+        min_speech_samples (int): Minimum segment length to keep.
+        speech_pad_samples (int): Padding added to both ends of each segment.
+
+    Returns:
+        List[Dict[str, int]]: Segments with 'start' and 'end' sample indices.
+    """
+    neg_threshold = threshold - 0.15
+    segments = []
+    triggered = False
+    current_start = 0
+    temp_end = 0
+
+    for i, prob in enumerate(probs):
+        pos = i * WINDOW_SAMPLES
+        if pos >= n_samples:
+            break
+        if prob >= threshold:
+            if not triggered:
+                triggered = True
+                current_start = pos
+            temp_end = 0
+        elif triggered and prob < neg_threshold:
+            if not temp_end:
+                temp_end = pos
+            elif pos - temp_end >= min_silence_samples:
+                if temp_end - current_start >= min_speech_samples:
+                    segments.append({'start': current_start, 'end': temp_end})
+                triggered = False
+                temp_end = 0
+
+    if triggered:
+        end = temp_end if temp_end else min(n_samples, len(probs) * WINDOW_SAMPLES)
+        if end - current_start >= min_speech_samples:
+            segments.append({'start': current_start, 'end': end})
+
+    for segment in segments:
+        segment['start'] = max(0, segment['start'] - speech_pad_samples)
+        segment['end'] = min(n_samples, segment['end'] + speech_pad_samples)
+
+    return segments
+
+
+def energy_prefilter(wav: torch.Tensor,
+                     frame: int = WINDOW_SAMPLES,
+                     ratio: float = 3.0) -> List[tuple[int, int]]:
+    """
+    Cheap stage-1 silence rejection based on frame energy.
+
+    Mean-square frame energies are compared against a noise floor tracked as
+    an exponential moving average over sub-threshold frames. Frames louder
+    than `ratio` times the floor become speech candidates; adjacent candidate
+    frames (padded by one frame on each side) merge into regions. Only those
+    regions need to be handed to the neural VAD.
+
+    Args:
+        wav (torch.Tensor): 1-D waveform.
+        frame (int): Frame size in samples.
+        ratio (float): Energy factor over the noise floor to flag a candidate.
+
+    Returns:
+        List[tuple[int, int]]: Candidate (start, end) regions in samples.
+    """
+    n_frames = len(wav) // frame
+    if n_frames == 0:
+        return [(0, len(wav))] if len(wav) else []
+
+    energies = wav[:n_frames * frame].unfold(0, frame, frame).pow(2).mean(-1).tolist()
+
+    eps = 1e-10
+    # Seed the floor from a low order statistic (10th percentile) of the
+    # frame energies: seeding from the first frame would raise the floor to
+    # speech level on files that open mid-speech, leaving zero candidates.
+    noise_floor = sorted(energies)[n_frames // 10] + eps
+    regions: List[tuple[int, int]] = []
+    region_start = None
+
+    for i, energy in enumerate(energies):
+        if energy > ratio * noise_floor:
+            if region_start is None:
+                region_start = max(i - 1, 0)
+        else:
+            noise_floor = 0.99 * noise_floor + 0.01 * energy
+            if region_start is not None:
+                regions.append((region_start * frame, min((i + 1) * frame, len(wav))))
+                region_start = None
+
+    if region_start is not None:
+        regions.append((region_start * frame, len(wav)))
+
+    return regions
+
+
+def chunked_speech_timestamps(wav: torch.Tensor,
+                              model: Any,
+                              chunk_seconds: int = 30,
+                              overlap_seconds: int = 1,
+                              threshold: float = 0.5) -> List[Dict[str, int]]:
+    """
+    Run Silero VAD over a waveform in fixed-size windows.
+
+    Long recordings are fed to the model in `chunk_seconds` windows with a
+    small overlap, so peak working memory is bounded by the window rather
+    than the file length. Segments straddling a boundary appear in both
+    windows as overlapping spans, which the downstream merge collapses.
+
+    Args:
+        wav (torch.Tensor): 1-D waveform at 16 kHz.
+        model: The Silero VAD model.
+        chunk_seconds (int): Window length in seconds.
+        overlap_seconds (int): Overlap between consecutive windows in seconds.
+        threshold (float): Speech probability threshold.
+
+    Returns:
+        List[Dict[str, int]]: Timestamps in sample indices over the full wav.
+    """
+    chunk_samples = chunk_seconds * SR
+    if len(wav) <= chunk_samples:
+        return get_speech_timestamps(wav, model, threshold=threshold)
+
+    timestamps: List[Dict[str, int]] = []
+    step = chunk_samples - overlap_seconds * SR
+    for start in range(0, len(wav), step):
+        window = wav[start:start + chunk_samples]
+        for ts in get_speech_timestamps(window, model, threshold=threshold):
+            timestamps.append({'start': ts['start'] + start, 'end': ts['end'] + start})
+        if start + chunk_samples >= len(wav):
+            break
+
+    timestamps.sort(key=lambda ts: ts['start'])
+    return timestamps
+
+
+def prefiltered_speech_timestamps(wav: torch.Tensor,
+                                  model: Any,
+                                  threshold: float = 0.5,
+                                  prefilter: bool = True) -> List[Dict[str, int]]:
+    """
+    Run Silero VAD only on the candidate regions found by energy_prefilter.
+
+    The prefilter is a speed heuristic, never an oracle: when it returns no
+    candidate regions the whole file is handed to the neural VAD anyway, so
+    a misjudged noise floor cannot declare a file speech-free on its own.
+
+    Args:
+        wav (torch.Tensor): 1-D waveform at 16 kHz.
+        model: The Silero VAD model.
+        threshold (float): Speech probability threshold.
+        prefilter (bool): If False, skip the energy heuristic entirely.
+
+    Returns:
+        List[Dict[str, int]]: Timestamps in sample indices over the full file.
+    """
+    regions = energy_prefilter(wav) if prefilter else [(0, len(wav))]
+    if not regions and len(wav):
+        regions = [(0, len(wav))]
+
+    timestamps: List[Dict[str, int]] = []
+    for start, end in regions:
+        for ts in chunked_speech_timestamps(wav[start:end], model, threshold=threshold):
+            timestamps.append({'start': ts['start'] + start, 'end': ts['end'] + start})
+    return timestamps
+
+
+def batched_speech_timestamps(wavs: List[torch.Tensor],
+                              model: Any,
+                              device: str,
+                              threshold: float = 0.5,
+                              gpu_buf: torch.Tensor = None) -> List[List[Dict[str, int]]]:
+    """
+    Run Silero VAD over several waveforms in one lock-stepped batch.
+
+    The waveforms are stepped through the model window-by-window with a batch
+    dimension, so each forward pass covers every file in the bucket instead
+    of a single 512-sample chunk. This amortizes kernel-launch overhead and
+    keeps the GPU occupied. Host staging happens in ~30 s blocks of windows —
+    each block is zero-padded, pinned and consumed before the next is built —
+    so page-locked memory stays O(batch_size * block) regardless of how long
+    the bucket's longest file is. Timestamps are recovered per file from the
+    probability matrix afterwards.
+
+    Args:
+        wavs (List[torch.Tensor]): Waveforms at 16 kHz, CPU tensors.
+        model: The Silero VAD model.
+        device (str): Device the model lives on.
+        threshold (float): Speech probability threshold.
+        gpu_buf (torch.Tensor): Optional preallocated (batch, WINDOW_SAMPLES)
+            device buffer reused across calls; allocated here when absent.
+
+    Returns:
+        List[List[Dict[str, int]]]: Per-file segments in sample indices.
+    """
+    lengths = [len(wav) for wav in wavs]
+    n_windows = -(-max(lengths) // WINDOW_SAMPLES)
+    block_windows = (30 * SR) // WINDOW_SAMPLES
+
+    if device != "cpu" and (gpu_buf is None or gpu_buf.shape[0] < len(wavs)):
+        gpu_buf = torch.empty(len(wavs), WINDOW_SAMPLES, device=device)
+
+    # Silero is robust to FP16; autocast halves tensor traffic on CUDA.
+    autocast = (torch.autocast('cuda', dtype=torch.float16) if device != "cpu"
+                else nullcontext())
+
+    model.reset_states()
+    probs = torch.empty(len(wavs), n_windows)
+    with torch.inference_mode(), autocast:
+        for block_start in range(0, n_windows, block_windows):
+            block_end = min(block_start + block_windows, n_windows)
+            block = torch.zeros(len(wavs), (block_end - block_start) * WINDOW_SAMPLES)
+            offset = block_start * WINDOW_SAMPLES
+            for i, wav in enumerate(wavs):
+                seg = wav[offset:offset + (block_end - block_start) * WINDOW_SAMPLES]
+                block[i, :len(seg)] = seg
+            if device != "cpu":
+                block = block.pin_memory()
+
+            for t in range(block_end - block_start):
+                chunk = block[:, t * WINDOW_SAMPLES:(t + 1) * WINDOW_SAMPLES]
+                if device != "cpu":
+                    # copy_ into the standing buffer instead of allocating a
+                    # fresh device tensor for every window of every batch.
+                    dst = gpu_buf[:len(wavs)]
+                    dst.copy_(chunk, non_blocking=True)
+                    chunk = dst
+                probs[:, block_start + t] = model(chunk, SR).view(-1).float().cpu()
+
+    return [probs_to_timestamps(probs[i].tolist(), lengths[i], threshold)
+            for i in range(len(wavs))]
+
+
+def export_segment_wavs(file_path: str,
+                        segments: List[Dict[str, float]],
+                        output_folder: str) -> None:
+    """
+    Export speech segments of a file as individual WAV files.
+
+    For PCM-16 sources the segments are cut by copying raw frames from the
+    source WAV and rewriting only the header, skipping the
+    int16 -> float -> int16 round-trip of a decode/re-encode. Other formats
+    fall back to decoding through soundfile.
+
+    Args:
+        file_path (str): Path to the source WAV file.
+        segments (List[Dict[str, float]]): Segments with 'start'/'end' in seconds.
+        output_folder (str): Folder the segment files are written to.
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+
+    def segment_path(segment: Dict[str, float]) -> str:
+        return os.path.join(output_folder, f"{stem}_{segment['start']:.2f}_{segment['end']:.2f}.wav")
+
+    try:
+        with wave.open(file_path, 'rb') as src:
+            if src.getsampwidth() != 2:
+                raise wave.Error(f"{file_path} is not 16-bit PCM")
+            n_channels, sampwidth, framerate = src.getparams()[:3]
+            for segment in segments:
+                start = int(segment['start'] * framerate)
+                n_frames = int(segment['end'] * framerate) - start
+                src.setpos(start)
+                raw = src.readframes(n_frames)
+                with wave.open(segment_path(segment), 'wb') as out:
+                    out.setparams((n_channels, sampwidth, framerate, n_frames, 'NONE', 'not compressed'))
+                    out.writeframes(raw)
+    except wave.Error:
+        # Non-PCM16 or non-WAV container: decode once and re-encode per segment.
+        data, framerate = sf.read(file_path, dtype='float32')
+        for segment in segments:
+            start = int(segment['start'] * framerate)
+            end = int(segment['end'] * framerate)
+            sf.write(segment_path(segment), data[start:end], framerate)
+
+
+class ProcessedIndex:
+    """
+    Read-only membership index over a processed_files.log backed by mmap.
+
+    Line offsets are collected in one scan and sorted by the bytes they point
+    at, so resuming a run costs O(log N) byte comparisons per lookup against
+    the mapped file instead of materializing every logged filename as a
+    Python string in a set.
+    """
+
+    def __init__(self, path: str):
+        self._mm = None
+        self._spans: List[tuple[int, int]] = []
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        mm = self._mm
+        start = 0
+        while start < len(mm):
+            end = mm.find(b'\n', start)
+            if end == -1:
+                end = len(mm)
+            if end > start:
+                self._spans.append((start, end))
+            start = end + 1
+
+        self._spans.sort(key=lambda span: mm[span[0]:span[1]])
+
+    def _line(self, span: tuple[int, int]) -> bytes:
+        return self._mm[span[0]:span[1]]
+
+    def __contains__(self, filename: str) -> bool:
+        if self._mm is None:
+            return False
+        needle = filename.encode()
+        idx = bisect.bisect_left(self._spans, needle, key=self._line)
+        return idx < len(self._spans) and self._line(self._spans[idx]) == needle
+
+
+def quantize_for_cpu(model: Any) -> Any:
+    """
+    Best-effort int8 dynamic quantization of the VAD model for CPU inference.
+
+    Dynamic quantization turns the Linear/LSTM matmuls that dominate the
+    model's runtime into int8 kernels. Silero ships as a TorchScript module,
+    which some torch versions cannot quantize in place; in that case the
+    FP32 model is returned unchanged.
+
+    Args:
+        model: The Silero VAD model.
+
+    Returns:
+        The quantized model, or the original one if quantization failed.
+    """
+    try:
+        quantized = torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8)
+        # Exercise the quantized model once before trusting it.
+        quantized.reset_states()
+        quantized(torch.zeros(1, WINDOW_SAMPLES), SR)
+        quantized.reset_states()
+        return quantized
+    except Exception as e:
+        logging.info(f"int8 quantization unavailable, keeping FP32 model: {e}")
+        return model
+
+
+def compile_model(model: Any, device: str = "cpu") -> Any:
+    """
+    Best-effort ahead-of-time specialization of the VAD model's forward.
+
+    The per-call work is tiny (one 512-sample window), so Python dispatch
+    overhead is a real fraction of runtime; torch.compile in reduce-overhead
+    mode amortizes it, with a TorchScript freeze as the fallback on older
+    torch. Each candidate is exercised once before being trusted, and the
+    original model is returned if neither applies.
+
+    Args:
+        model: The Silero VAD model.
+        device (str): Device the model lives on, used for the trial input.
+
+    Returns:
+        The specialized model, or the original one if specialization failed.
+    """
+    probe = torch.zeros(1, WINDOW_SAMPLES, device=device)
+    try:
+        compiled = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+        compiled.reset_states()
+        compiled(probe, SR)
+        compiled.reset_states()
+        return compiled
+    except Exception as e:
+        logging.info(f"torch.compile unavailable: {e}")
+    try:
+        # freeze keeps only forward by default; reset_states must survive
+        # for the per-file/per-batch state resets.
+        frozen = torch.jit.freeze(torch.jit.script(model), preserved_attrs=["reset_states"])
+        frozen.reset_states()
+        frozen(probe, SR)
+        frozen.reset_states()
+        return frozen
+    except Exception as e:
+        logging.info(f"TorchScript freeze unavailable, keeping the eager model: {e}")
+    return model
+
+
+# Model loaded once per worker process by init_worker; used by process_single_file.
+_WORKER_MODEL = None
+_WORKER_DEVICE = "cpu"
+
+
+def init_worker(device: str = "cpu") -> None:
+    """
+    Pool initializer: load the Silero model once into the worker process.
+
+    Args:
+        device (str): Device to place the model on.
+    """
+    global _WORKER_MODEL, _WORKER_DEVICE
+    _WORKER_DEVICE = device
+    _WORKER_MODEL = load_silero_vad()
+    if device != "cpu":
+        _WORKER_MODEL = _WORKER_MODEL.to(device)
+    _WORKER_MODEL.eval()
+    if device == "cpu":
+        _WORKER_MODEL = quantize_for_cpu(_WORKER_MODEL)
+    _WORKER_MODEL = compile_model(_WORKER_MODEL, device)
+
+
+def _vad_worker(file_path: str,
+                vad_threshold: float = 0.5,
+                prefilter: bool = True) -> tuple[int, List[Dict[str, int]]]:
+    """
+    Pool worker: load one file and run VAD with the worker-global model.
+
+    Args:
+        file_path (str): Path to the WAV file.
+        vad_threshold (float): Speech probability threshold.
+        prefilter (bool): Whether to gate the VAD behind the energy prefilter.
+
+    Returns:
+        tuple[int, List[Dict[str, int]]]: Waveform length in samples and the
+        raw speech timestamps; merging and filtering stay in the parent.
+    """
+    wav = load_audio(file_path)
+    with torch.inference_mode():
+        return len(wav), prefiltered_speech_timestamps(wav, _WORKER_MODEL,
+                                                       threshold=vad_threshold, prefilter=prefilter)
+
+
+def process_single_file(file_path: str,
+                        threshold: float = 0.250,
+                        min_duration: float = 0.5,
+                        vad_threshold: float = 0.5,
+                        model: Any = None,
+                        device: str = None) -> tuple[bool, List[Dict[str, float]]]:
+    """
+    Run VAD on a single file and return its cleaned speech segments.
+
+    Falls back to the worker-global model installed by init_worker when no
+    model is given, so pool workers pay the model-load cost only once.
+
+    Args:
+        file_path (str): Path to the WAV file.
+        threshold (float): Time threshold to merge segments.
+        min_duration (float): Minimum duration of segments to keep.
+        vad_threshold (float): Speech probability threshold.
+        model: The Silero VAD model; defaults to the worker-global one.
+        device (str): Device the model lives on; defaults to the worker's.
+
+    Returns:
+        tuple[bool, List[Dict[str, float]]]: Whether any speech was detected,
+        and the merged segments (in seconds) that survived filtering.
+    """
+    if model is None:
+        model = _WORKER_MODEL
+    if device is None:
+        device = _WORKER_DEVICE
+
+    wav = load_audio(file_path)
+    # get_speech_timestamps feeds the waveform to the model as-is, so it has
+    # to live on the model's device.
+    if device != "cpu":
+        wav = wav.to(device, non_blocking=True)
+    with torch.inference_mode():
+        speech_timestamps = prefiltered_speech_timestamps(wav, model, threshold=vad_threshold)
+    if not speech_timestamps:
+        return False, []
+
+    utterances = [{'start': utt['start'] * INV_SR, 'end': utt['end'] * INV_SR,
+                   'duration': (utt['end'] - utt['start']) * INV_SR} for utt in speech_timestamps]
+    cleaned = merge_segments(utterances, threshold)
+    return True, [utt for utt in cleaned if utt['duration'] >= min_duration]
+
+
+def merge_segment_arrays(starts: np.ndarray,
+                         ends: np.ndarray,
+                         threshold: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge segments that are closer than the given threshold, array-to-array.
+
+    Structure-of-arrays core of the merge: gaps between consecutive segments
+    mark group boundaries, and each group collapses to one span via reduceat.
+    Everything stays in contiguous float64 arrays so callers can filter and
+    aggregate without boxing each segment into a dict.
+
+    Args:
+        starts (np.ndarray): Segment start times, sorted ascending.
+        ends (np.ndarray): Segment end times.
+        threshold (float): Time threshold to merge segments.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Merged (starts, ends, durations).
+    """
+    if len(starts) == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty.copy(), empty.copy()
+
+    gaps = starts[1:] - ends[:-1]
+    group_starts = np.flatnonzero(np.concatenate(([True], gaps >= threshold)))
+
+    merged_starts = starts[group_starts]
+    merged_ends = np.maximum.reduceat(ends, group_starts)
+    return merged_starts, merged_ends, merged_ends - merged_starts
+
+
 def merge_segments(segments: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
     """
     Merge segments that are closer than the given threshold.
 
+    Dict-based wrapper around merge_segment_arrays for callers that work in
+    the 'start'/'end'/'duration' dict representation.
+
     Args:
         segments (List[Dict[str, Any]]): List of segments with 'start', 'end', and 'duration'.
         threshold (float): Time threshold to merge segments.
@@ -45,19 +612,14 @@ def merge_segments(segments: List[Dict[str, Any]], threshold: float) -> List[Dic
     if not segments:
         return []
 
-    merged_segments = []
-    current_segment = segments[0]
+    n = len(segments)
+    starts = np.fromiter((segment['start'] for segment in segments), dtype=np.float64, count=n)
+    ends = np.fromiter((segment['end'] for segment in segments), dtype=np.float64, count=n)
 
-    for next_segment in segments[1:]:
-        if next_segment['start'] - current_segment['end'] < threshold:
-            current_segment['end'] = next_segment['end']
-            current_segment['duration'] = current_segment['end'] - current_segment['start']
-        else:
-            merged_segments.append(current_segment)
-            current_segment = next_segment
+    merged_starts, merged_ends, durations = merge_segment_arrays(starts, ends, threshold)
 
-    merged_segments.append(current_segment)
-    return merged_segments
+    return [{'start': start, 'end': end, 'duration': duration}
+            for start, end, duration in zip(merged_starts.tolist(), merged_ends.tolist(), durations.tolist())]
 
 
 def process_wav_files(folder: str | os.PathLike,
@@ -66,7 +628,12 @@ def process_wav_files(folder: str | os.PathLike,
                       log_folder: str = "logs",
                       threshold: float = 0.250,
                       min_duration: float = 0.5,
-                      device: str = "cpu") -> None:
+                      vad_threshold: float = 0.5,
+                      prefilter: bool = True,
+                      device: str = "cpu",
+                      batch_size: int = 32,
+                      num_workers: int = os.cpu_count(),
+                      export_segments: str = None) -> None:
     """
     Process all WAV files in the given folder, merge segments, and optionally export new WAV files.
     If a list of files is not provided, all the folder contents will be used instead.
@@ -77,10 +644,29 @@ def process_wav_files(folder: str | os.PathLike,
         log_folder (str): Path to the folder for log files.
         threshold (float): Time threshold to merge segments.
         min_duration (float): Minimum duration of segments to keep.
+        vad_threshold (float): Speech probability above which a window counts as speech.
+        prefilter (bool): Gate the neural VAD behind the energy prefilter on the CPU paths.
         device: device used for computation. In practice, using a GPU isn't proven to speed-up processing.
+        batch_size (int): Number of files run through the model per forward pass on GPU.
+        num_workers (int): Worker processes for the CPU path; 1 keeps everything in-process.
+        export_segments (str): If set, folder to export each speech segment to as a WAV file.
     """
-    model = load_silero_vad().to(device)
-    all_durations = []
+    # With a CPU worker pool each worker loads its own model via init_worker,
+    # so the parent never needs one.
+    parallel_cpu = device == "cpu" and num_workers > 1
+    model = None if parallel_cpu else load_silero_vad()
+    if model is not None:
+        # The model loads on CPU, so .to is only worth dispatching for an
+        # actual device move.
+        if device != "cpu":
+            model = model.to(device)
+        model.eval()
+        if device == "cpu":
+            model = quantize_for_cpu(model)
+        model = compile_model(model, device)
+    # Per-file duration arrays, concatenated once after the loop: appending
+    # one ndarray per file avoids both boxed floats and per-segment growth.
+    all_durations: List[np.ndarray] = []
     total_audio_duration = 0
     total_speech_duration = 0
     total_segments = 0
@@ -100,72 +686,211 @@ def process_wav_files(folder: str | os.PathLike,
     warning_log = os.path.join(log_folder, 'warning_files.log')
     speech_segments_file = os.path.join(log_folder, 'speech_segments.csv')
 
-    processed_files = set()
-    if os.path.exists(processed_log):
-        with open(processed_log, 'r') as f:
-            processed_files = set(f.read().splitlines())
+    processed_files = ProcessedIndex(processed_log)
 
     if file_list:
-        wav_files = [f for f in file_list if f.endswith('.wav') and f not in processed_files]
+        # Normalize to basenames: the processed log stores bare filenames, so
+        # path-qualified entries would never match and files would re-run
+        # full VAD on every restart.
+        wav_files = [os.path.basename(f) for f in file_list
+                     if f.endswith('.wav') and os.path.basename(f) not in processed_files]
     else:
-        wav_files = [f for f in os.listdir(folder) if f.endswith('.wav') and f not in processed_files]
+        with os.scandir(folder) as it:
+            wav_files = [entry.name for entry in it
+                         if entry.name.endswith('.wav') and entry.name not in processed_files]
+
+    # Open every output once up front with large buffers instead of
+    # re-opening per event; re-opening cost one open/close syscall pair
+    # per processed file, warning and error.
+    with ExitStack() as stack:
+        csvfile = stack.enter_context(open(speech_segments_file, 'w', newline='', buffering=1 << 20))
+        # Line-buffered: resume markers reach disk as soon as they are written.
+        processed_fh = stack.enter_context(open(processed_log, 'a', buffering=1))
+        warning_fh = stack.enter_context(open(warning_log, 'a', buffering=1 << 16))
+        error_fh = stack.enter_context(open(error_log, 'a', buffering=1 << 16))
 
-    with open(speech_segments_file, 'w', newline='') as csvfile:
         fieldnames = ['filename', 'segment_id', 'start', 'end', 'duration']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+        csvfile.write(','.join(fieldnames) + '\n')
+
+        # Rows are pre-formatted and buffered, then written in one writelines
+        # call per batch; none of the fields can contain a comma, so the csv
+        # module's per-row escaping machinery buys nothing here. Resume
+        # markers are held back with the rows and only written once those
+        # rows are flushed, so a crash can never leave a file marked
+        # processed while its segments are still in a stream buffer.
+        row_batch: List[str] = []
+        pending_processed: List[str] = []
+        ROW_BATCH_SIZE = 4096
+
+        def flush_rows() -> None:
+            """Flush buffered CSV rows to disk, then mark their files processed."""
+            if row_batch:
+                csvfile.writelines(row_batch)
+                row_batch.clear()
+            csvfile.flush()
+            if pending_processed:
+                processed_fh.writelines(pending_processed)
+                pending_processed.clear()
+
+        def handle_file(filename: str, speech_timestamps: List[Dict[str, int]]) -> None:
+            """Turn raw timestamps for one file into merged segments, logs and CSV rows."""
+            nonlocal total_speech_duration, total_segments, files_without_speech
+
+            if not speech_timestamps:
+                logging.warning(f"No speech in {filename}")
+                warning_fh.write(f"{filename}\n")
+                files_without_speech += 1
+                return
+
+            # Structure-of-arrays: the segments travel as three contiguous
+            # float64 arrays through merge, filter and aggregation instead of
+            # as a list of per-segment dicts.
+            n = len(speech_timestamps)
+            raw_starts = np.fromiter((utt['start'] for utt in speech_timestamps), dtype=np.float64, count=n)
+            raw_ends = np.fromiter((utt['end'] for utt in speech_timestamps), dtype=np.float64, count=n)
+            starts, ends, durations = merge_segment_arrays(raw_starts * INV_SR, raw_ends * INV_SR, threshold)
+
+            keep = durations >= min_duration
+            starts, ends, durations = starts[keep], ends[keep], durations[keep]
+
+            total_speech_duration += durations.sum()
+            total_segments += len(durations)
+            all_durations.append(durations)
+
+            pending_processed.append(f"{filename}\n")
+
+            logging.info(f"Processed file: {filename}")
+
+            # Queue speech segments for the CSV file
+            stem = os.path.splitext(filename)[0]
+            row_batch.extend(
+                f"{filename},{stem}_{start:.2f}_{end:.2f},{start},{end},{duration}\n"
+                for start, end, duration in zip(starts.tolist(), ends.tolist(), durations.tolist())
+            )
+            if len(row_batch) >= ROW_BATCH_SIZE:
+                flush_rows()
+
+            if export_segments:
+                segments = [{'start': start, 'end': end}
+                            for start, end in zip(starts.tolist(), ends.tolist())]
+                export_segment_wavs(os.path.join(folder, filename), segments, export_segments)
+
+        if export_segments:
+            os.makedirs(export_segments, exist_ok=True)
 
         try:
-            for filename in tqdm(wav_files, desc="Processing files", unit="file"):
-                file_path = os.path.join(folder, filename)
-                tqdm.write(f"Processing {filename}")
-                try:
-                    wav = read_audio(file_path).to(device)
-                    total_audio_duration += len(wav) / 16_000  # Assuming 16kHz sample rate
-                    speech_timestamps = get_speech_timestamps(wav, model)
-                    if not speech_timestamps:
-                        logging.warning(f"No speech in {filename}")
-                        with open(warning_log, 'a') as f:
-                            f.write(f"{filename}\n")
-                        files_without_speech += 1
+            if parallel_cpu:
+                # Silero on CPU is single-threaded per call and files are
+                # independent, so fan them out across worker processes; the
+                # parent stays the single writer of the CSV and logs.
+                with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker) as executor:
+                    futures = {executor.submit(_vad_worker, os.path.join(folder, filename),
+                                               vad_threshold, prefilter): filename
+                               for filename in wav_files}
+                    for future in tqdm(as_completed(futures), total=len(futures),
+                                       desc="Processing files", unit="file"):
+                        filename = futures[future]
+                        try:
+                            n_samples, speech_timestamps = future.result()
+                            total_audio_duration += n_samples * INV_SR
+                            handle_file(filename, speech_timestamps)
+                        except Exception as e:
+                            error_fh.write(f"{filename}: {e}\n")
+                            logging.error(f"Error processing file {filename}: {e}")
+            elif device == "cpu":
+                # Decode upcoming files on a small thread pool (I/O bound) so
+                # disk reads overlap model inference; at most PREFETCH decoded
+                # waveforms are held at once. inference_mode drops autograd
+                # bookkeeping for the whole loop.
+                PREFETCH = 8
+                progress = tqdm(total=len(wav_files), desc="Processing files", unit="file")
+                with torch.inference_mode(), ThreadPoolExecutor(max_workers=4) as loader:
+                    pending: deque = deque()
+                    next_idx = 0
+                    while next_idx < len(wav_files) or pending:
+                        while next_idx < len(wav_files) and len(pending) < PREFETCH:
+                            filename = wav_files[next_idx]
+                            pending.append((filename, loader.submit(load_audio, os.path.join(folder, filename))))
+                            next_idx += 1
+
+                        filename, future = pending.popleft()
+                        tqdm.write(f"Processing {filename}")
+                        try:
+                            wav = future.result()
+                            total_audio_duration += len(wav) * INV_SR  # load_audio resamples to SR
+                            speech_timestamps = prefiltered_speech_timestamps(wav, model, threshold=vad_threshold,
+                                                                              prefilter=prefilter)
+                            handle_file(filename, speech_timestamps)
+                            del wav, speech_timestamps
+                        except Exception as e:
+                            error_fh.write(f"{filename}: {e}\n")
+                            logging.error(f"Error processing file {filename}: {e}")
+                        progress.update(1)
+                progress.close()
+            else:
+                # On GPU, run a bucket of files through the model per forward pass
+                # instead of one 512-sample chunk of one file at a time.
+                # Bucket files of similar length together: sorting by header
+                # duration (cheap, no decode) keeps padding-to-longest waste
+                # small instead of letting one long recording pad a whole
+                # directory-ordered bucket.
+                def header_duration(filename: str) -> float:
+                    try:
+                        return get_audio_duration(os.path.join(folder, filename))
+                    except Exception:
+                        return 0.0
+
+                wav_files.sort(key=header_duration)
+                files_since_cleanup = 0
+                # One standing device-side input buffer for the whole run; each
+                # window is copied into it rather than allocated afresh.
+                gpu_buf = torch.empty(batch_size, WINDOW_SAMPLES, device=device)
+                buckets = range(0, len(wav_files), batch_size)
+                for start in tqdm(buckets, desc="Processing batches", unit="batch"):
+                    bucket = wav_files[start:start + batch_size]
+                    wavs, names = [], []
+                    for filename in bucket:
+                        file_path = os.path.join(folder, filename)
+                        try:
+                            wavs.append(load_audio(file_path))
+                            names.append(filename)
+                        except Exception as e:
+                            error_fh.write(f"{filename}: {e}\n")
+                            logging.error(f"Error reading file {filename}: {e}")
+                    if not wavs:
                         continue
 
-                    utterances = [{'start': utt['start'] / 16_000, 'end': utt['end'] / 16_000,
-                                   'duration': (utt['end'] - utt['start']) / 16_000} for utt in speech_timestamps]
-                    cleaned = merge_segments(utterances, threshold)
-                    cleaned = [utt for utt in cleaned if utt['duration'] >= min_duration]
-
-                    total_speech_duration += sum(utt['duration'] for utt in cleaned)
-                    total_segments += len(cleaned)
-                    all_durations.extend([segment['duration'] for segment in cleaned])
-
-                    with open(processed_log, 'a') as f:
-                        f.write(f"{filename}\n")
-                        f.flush()  # Flush data to disk immediately
-
-                    logging.info(f"Processed file: {filename}")
-
-                    # Write speech segments to CSV file
-                    for segment in cleaned:
-                        segment_id = f"{os.path.splitext(filename)[0]}_{segment['start']:.2f}_{segment['end']:.2f}"
-                        writer.writerow({
-                            'filename': filename,
-                            'segment_id': segment_id,
-                            'start': segment['start'],
-                            'end': segment['end'],
-                            'duration': segment['duration']
-                        })
-                        csvfile.flush()  # Flush data to disk immediately
-
-                except Exception as e:
-                    with open(error_log, 'a') as f:
-                        f.write(f"{filename}: {e}\n")
-                    logging.error(f"Error processing file {filename}: {e}")
+                    total_audio_duration += sum(len(wav) for wav in wavs) * INV_SR
+                    try:
+                        results = batched_speech_timestamps(wavs, model, device,
+                                                            threshold=vad_threshold, gpu_buf=gpu_buf)
+                    except Exception as e:
+                        for filename in names:
+                            error_fh.write(f"{filename}: {e}\n")
+                        logging.error(f"Error processing batch at file {names[0]}: {e}")
+                        continue
+
+                    for filename, speech_timestamps in zip(names, results):
+                        tqdm.write(f"Processing {filename}")
+                        handle_file(filename, speech_timestamps)
+
+                    # Drop the bucket's tensors before the next iteration and
+                    # trim the caching allocator's reserved pool periodically
+                    # (empty_cache is too expensive to call per batch).
+                    del wavs, results
+                    files_since_cleanup += len(names)
+                    if files_since_cleanup >= 64:
+                        files_since_cleanup = 0
+                        torch.cuda.empty_cache()
+                        logging.info(f"CUDA memory reserved: {torch.cuda.memory_reserved() / 1e9:.2f} GB")
 
         except KeyboardInterrupt:
+            # The ExitStack flushes and closes every output on the way out.
             print("\nKeyboard interrupt detected. Cleaning up and exiting gracefully.")
-            csvfile.close()
             sys.exit(0)
+        finally:
+            flush_rows()
+            all_durations = np.concatenate(all_durations) if all_durations else np.empty(0)
 
 
 if __name__ == "__main__":
@@ -174,20 +899,34 @@ if __name__ == "__main__":
     parser.add_argument('--log_folder', type=str, default="logs", help="Path to the folder for log files.")
     parser.add_argument('--threshold', type=float, default=0.250, help="Time threshold to merge segments.")
     parser.add_argument('--min_duration', type=float, default=0.5, help="Minimum duration of segments to keep.")
+    parser.add_argument('--vad_threshold', type=float, default=0.5,
+                        help="Speech probability above which a window counts as speech.")
+    parser.add_argument('--no_prefilter', action='store_true',
+                        help="Run the neural VAD on whole files instead of energy-prefiltered regions.")
     parser.add_argument('--cuda', action='store_true', help="Use CUDA for GPU acceleration (if available).")
+    parser.add_argument('--num_workers', type=int, default=os.cpu_count(),
+                        help="Number of worker processes for the CPU path.")
+    parser.add_argument('--export_segments', type=str, default=None,
+                        help="Folder to export each detected speech segment to as a WAV file.")
 
     args = parser.parse_args()
 
     setup_logging(args.log_folder)
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    # Kept as a plain string: the device checks in process_wav_files compare
+    # against "cpu" and torch accepts strings everywhere it is used.
+    device = "cuda" if args.cuda and torch.cuda.is_available() else "cpu"
 
     process_wav_files(
         args.folder,
-        args.log_folder,
-        args.threshold,
-        args.min_duration,
-        device
+        log_folder=args.log_folder,
+        threshold=args.threshold,
+        min_duration=args.min_duration,
+        vad_threshold=args.vad_threshold,
+        prefilter=not args.no_prefilter,
+        device=device,
+        num_workers=args.num_workers,
+        export_segments=args.export_segments
     )
 
     # Create an instance of the Report class and call it